@@ -1,38 +1,183 @@
 #!/usr/bin/env python3
 import sqlite3
+import asyncio
+import functools
+import json
+import time
 import argparse
 import arxiv
 import sys
 import re
-from itertools import permutations
-from typing import List
+from typing import Callable, List, Optional
 from urllib.parse import urlparse
 from datetime import datetime
 import webbrowser
+from collections import OrderedDict
+from textual import work
 from textual.app import App, ComposeResult
-from textual.widgets import Header, Footer, DataTable, Input, ListView, ListItem, Label
-from textual.suggester import SuggestFromList
+from textual.widgets import Header, Footer, DataTable, Input, OptionList
+from textual.widgets.option_list import Option
+from textual.suggester import Suggester
 from textual.containers import Container
 
-ARXIV_REGEX = r'\b([\w-]+\/[\w\.]+?)(\.pdf)?$'
+# arxiv.org/abs/... or /pdf/... links on any host variant (www., export.)
+_ARXIV_URL_RE = re.compile(r'arxiv\.org/(?:abs|pdf)/([^?#]+)')
+# 2107.05580, 2107.05580v2
+_ARXIV_NEW_ID_RE = re.compile(r'\d{4}\.\d{4,5}(v\d+)?')
+# hep-th/9901001, math.GT/0309136v1
+_ARXIV_OLD_ID_RE = re.compile(r'[a-z-]+(\.[A-Z]{2})?/\d{7}(v\d+)?')
+_TAG_SPLIT = re.compile(r'\s*,\s*')
+# several IDs or links can be pasted at once, separated by commas or spaces
+_ID_SPLIT = re.compile(r'[\s,]+')
+_PREFIXES = ("http://arxiv.org/abs/", "https://arxiv.org/abs/", "https://arxiv.org/pdf/", "http://arxiv.org/pdf/")
 
 def strip_url(arg):
     arg = arg.strip()
-    arg = arg.removeprefix("http://arxiv.org/abs/")
-    arg = arg.removeprefix("https://arxiv.org/abs/")
-    arg = arg.removeprefix("https://arxiv.org/pdf/")
-    arg = arg.removeprefix("http://arxiv.org/pdf/")
+    for p in _PREFIXES:
+        if arg.startswith(p):
+            arg = arg[len(p):]
+            break
+    if arg.endswith(".pdf"):
+        arg = arg[:-4]
+    # drop a version suffix (2107.05580v2 -> 2107.05580) so lookups share cache keys
+    head, sep, version = arg.rpartition("v")
+    if sep and version.isdigit() and head[-1:].isdigit():
+        arg = head
     return arg.strip()
 
 #TODO: pull the db path from the .babelrc file
 DB_PATH = 'babel.db'
+ARXIV_CACHE_TTL = 24 * 60 * 60
+# bump whenever migrate_db gains a step, so existing databases run it again
+CURRENT_SCHEMA_VERSION = 1
+# column keys of the papers table, matching the first four fields of a row
+TABLE_COLUMNS = ("arxiv_id", "title", "authors", "tags")
+# flag returned by input handlers that need the papers table redrawn
+RELOAD = 1
 # instantiate a single Client to avoid deprecated Search.results()
 client = arxiv.Client()
 
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
+def entry_meta(entry: arxiv.Result) -> tuple:
+    """
+    Flatten an arxiv result into the immutable tuple stored in the papers table:
+    (short_id, title, summary, published, authors, entry_id).
+    """
+    return (
+        entry.get_short_id(),
+        entry.title,
+        entry.summary,
+        entry.published.strftime('%Y-%m-%d'),
+        ', '.join(a.name for a in entry.authors),
+        entry.entry_id,
+    )
+
+# Search objects only hold query parameters, so the same one can be reused
+@functools.lru_cache(maxsize=128)
+def _search_by_id(aid: str) -> arxiv.Search:
+    return arxiv.Search(id_list=[aid])
+
+@functools.lru_cache(maxsize=128)
+def _search_by_title(title: str) -> arxiv.Search:
+    # callers pass the title stripped and lowercased, arXiv search ignores case anyway
+    return arxiv.Search(query=f'ti:{title}', max_results=20)
+
+@functools.lru_cache(maxsize=256)
+def fetch_arxiv_meta(aid: str) -> tuple:
+    # repeated lookups of the same ID skip the network entirely;
+    # misses raise so that they are not cached
+    search = _search_by_id(aid)
+    entry = next(client.results(search), None)
+    if entry is None:
+        raise LookupError(aid)
+    return entry_meta(entry)
+
+def fetch_arxiv_metas(aids: List[str]) -> List[tuple]:
+    # one request for the whole batch instead of one per ID; IDs that
+    # arXiv doesn't know are simply missing from the result
+    search = arxiv.Search(id_list=aids, max_results=len(aids))
+    return [entry_meta(entry) for entry in client.results(search)]
+
+def search_arxiv_titles(title: str) -> List[tuple]:
+    # at most 20 hits, see _search_by_title
+    return [entry_meta(entry) for entry in client.results(_search_by_title(title))]
+
+def connect_db() -> sqlite3.Connection:
+    # one long-lived connection for the whole session; writes are grouped
+    # into transactions with `with conn:`
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn.executescript('''
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-20000;
+        PRAGMA mmap_size=268435456;
+        PRAGMA foreign_keys=ON;
+    ''')
+    return conn
+
+# statements run on every interaction; sqlite3 caches the prepared form by
+# SQL text, so they are kept here to always hit that cache
+# stored IDs keep their version (get_short_id), while strip_url drops it from
+# user input, so a bare ID also matches any stored version of it; the range
+# form (every ID starting with ?1 || 'v') keeps this an index search
+PAPER_ID_SQL = "SELECT id FROM papers WHERE arxiv_id = ?1 OR (arxiv_id > ?1 || 'v' AND arxiv_id < ?1 || 'w')"
+INSERT_PAPER_SQL = '''
+    INSERT INTO papers (arxiv_id, title, summary, published, authors, url, authors_short)
+    VALUES (?,?,?,?,?,?,?)
+    ON CONFLICT(arxiv_id) DO NOTHING
+    RETURNING id
+'''
+DELETE_PAPER_SQL = 'DELETE FROM papers WHERE arxiv_id=?'
+INSERT_TAG_SQL = 'INSERT OR IGNORE INTO tags (name) VALUES (?)'
+LINK_TAG_SQL = 'INSERT OR IGNORE INTO paper_tags (paper_id, tag_id) SELECT ?, id FROM tags WHERE name=?'
+UNLINK_TAGS_SQL = 'DELETE FROM paper_tags WHERE paper_id=?'
+CURRENT_TAGS_SQL = '''
+    SELECT GROUP_CONCAT(t.name, ', ')
+    FROM tags t
+    JOIN paper_tags pt ON t.id = pt.tag_id
+    JOIN papers p ON pt.paper_id = p.id
+    WHERE p.arxiv_id = ?
+'''
+
+def short_authors(authors: str) -> str:
+    # last names of the first five authors, as shown in the table
+    names = [n.strip() for n in authors.split(", ")] if authors else []
+    last5 = [n.split()[-1] for n in names[:5]]
+    return ", ".join(last5)
+
+# deleting a paper takes its tag links with it
+PAPER_TAGS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS {name} (
+        paper_id INTEGER,
+        tag_id INTEGER,
+        UNIQUE(paper_id, tag_id),
+        FOREIGN KEY(paper_id) REFERENCES papers(id) ON DELETE CASCADE,
+        FOREIGN KEY(tag_id) REFERENCES tags(id)
+    )'''
+
+def has_fts(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name='papers_fts'").fetchone() is not None
+
+def fts_query(query: str) -> str:
+    # every word as a quoted prefix term, so partial words still match
+    # and user input can't produce FTS syntax errors
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in query.split())
+
+def init_db(conn: sqlite3.Connection):
+    # the schema is only built (or upgraded) when user_version is behind,
+    # so a normal start skips straight to the cache pruning
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    if version < CURRENT_SCHEMA_VERSION:
+        migrate_db(conn)
+        conn.execute(f'PRAGMA user_version = {CURRENT_SCHEMA_VERSION}')
+    with conn:
+        conn.execute('DELETE FROM arxiv_cache WHERE fetched_at <= ?', (int(time.time()) - ARXIV_CACHE_TTL,))
+
+# brings a database of any earlier version up to CURRENT_SCHEMA_VERSION;
+# every step is safe to repeat
+def migrate_db(conn: sqlite3.Connection):
     c = conn.cursor()
-    c.execute('''
+    c.executescript(f'''
     CREATE TABLE IF NOT EXISTS papers (
         id INTEGER PRIMARY KEY,
         arxiv_id TEXT UNIQUE,
@@ -40,77 +185,126 @@ def init_db():
         summary TEXT,
         published TEXT,
         authors TEXT,
-        url TEXT
-    )''')
-    c.execute('''
+        url TEXT,
+        authors_short TEXT
+    );
     CREATE TABLE IF NOT EXISTS tags (
         id INTEGER PRIMARY KEY,
         name TEXT UNIQUE
-    )''')
+    );
+    {PAPER_TAGS_SCHEMA.format(name='paper_tags')};
+    ''')
+    # older databases predate the precomputed author column
+    columns = [row[1] for row in c.execute('PRAGMA table_info(papers)')]
+    if 'authors_short' not in columns:
+        c.execute('ALTER TABLE papers ADD COLUMN authors_short TEXT')
+    # backfill in a single UPDATE, with the python helper exposed to sqlite
+    conn.create_function("last_names_5", 1, short_authors, deterministic=True)
+    with conn:
+        c.execute('UPDATE papers SET authors_short = last_names_5(authors) WHERE authors_short IS NULL')
+    # sqlite can't alter a foreign key, so older link tables are rebuilt with the
+    # cascade; links to papers that no longer exist are dropped on the way
+    fks = c.execute('PRAGMA foreign_key_list(paper_tags)').fetchall()
+    if not any(fk[2] == 'papers' and fk[6] == 'CASCADE' for fk in fks):
+        c.executescript(f'''
+            BEGIN;
+            {PAPER_TAGS_SCHEMA.format(name='paper_tags_new')};
+            INSERT OR IGNORE INTO paper_tags_new (paper_id, tag_id)
+                SELECT paper_id, tag_id FROM paper_tags
+                WHERE paper_id IN (SELECT id FROM papers);
+            DROP TABLE paper_tags;
+            ALTER TABLE paper_tags_new RENAME TO paper_tags;
+            COMMIT;
+        ''')
+    # arXiv responses, as JSON lists of entry_meta tuples; arXiv only
+    # updates daily, so entries are good for ARXIV_CACHE_TTL seconds
     c.execute('''
-    CREATE TABLE IF NOT EXISTS paper_tags (
-        paper_id INTEGER,
-        tag_id INTEGER,
-        UNIQUE(paper_id, tag_id),
-        FOREIGN KEY(paper_id) REFERENCES papers(id),
-        FOREIGN KEY(tag_id) REFERENCES tags(id)
+    CREATE TABLE IF NOT EXISTS arxiv_cache (
+        key TEXT PRIMARY KEY,
+        fetched_at INTEGER,
+        payload TEXT
     )''')
-    conn.commit()
-    conn.close()
-
-
-def all_comma_separated(arr: List[str]) -> List[str]:
-    """
-    Generate all comma-separated strings from the input list,
-    of lengths 1 through len(arr), with no repeated elements.
-
-    :param arr: List of unique strings.
-    :return: List of comma-separated strings.
-    """
-    results: List[str] = []
-    for r in range(1, len(arr) + 1):
-        for perm in permutations(arr, r):
-            results.append(", ".join(perm))
-    return results
+    c.execute('CREATE INDEX IF NOT EXISTS idx_paper_tags_tag ON paper_tags(tag_id)')
+    # remove a tag as soon as the last paper using it lets go of it
+    c.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_purge_tag AFTER DELETE ON paper_tags
+    BEGIN
+        DELETE FROM tags WHERE id = OLD.tag_id
+            AND NOT EXISTS (SELECT 1 FROM paper_tags WHERE tag_id = OLD.tag_id);
+    END''')
+    # databases from before the trigger may still hold orphaned tags
+    with conn:
+        c.execute('DELETE FROM tags WHERE id NOT IN (SELECT tag_id FROM paper_tags)')
+    # full-text index over the papers table for searching, kept in sync by
+    # triggers; builds of sqlite without FTS5 fall back to LIKE (see has_fts)
+    try:
+        new_fts = not has_fts(conn)
+        c.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+            title, authors, summary,
+            content='papers', content_rowid='id', tokenize='porter unicode61'
+        )''')
+    except sqlite3.OperationalError:
+        pass
+    else:
+        c.executescript('''
+        CREATE TRIGGER IF NOT EXISTS papers_fts_ai AFTER INSERT ON papers BEGIN
+            INSERT INTO papers_fts(rowid, title, authors, summary)
+            VALUES (new.id, new.title, new.authors, new.summary);
+        END;
+        CREATE TRIGGER IF NOT EXISTS papers_fts_ad AFTER DELETE ON papers BEGIN
+            INSERT INTO papers_fts(papers_fts, rowid, title, authors, summary)
+            VALUES ('delete', old.id, old.title, old.authors, old.summary);
+        END;
+        CREATE TRIGGER IF NOT EXISTS papers_fts_au AFTER UPDATE ON papers BEGIN
+            INSERT INTO papers_fts(papers_fts, rowid, title, authors, summary)
+            VALUES ('delete', old.id, old.title, old.authors, old.summary);
+            INSERT INTO papers_fts(rowid, title, authors, summary)
+            VALUES (new.id, new.title, new.authors, new.summary);
+        END;
+        ''')
+        if new_fts:
+            # index the papers that were added before the index existed
+            with conn:
+                c.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
+    # newest-first order used by the table and its keyset paging
+    c.execute('CREATE INDEX IF NOT EXISTS idx_papers_published ON papers(published DESC, id DESC)')
 
 
-def get_all_tags() -> list[str]:
+def get_all_tags(conn: sqlite3.Connection) -> list[str]:
         # get all tags from the database
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('SELECT id, name FROM tags ORDER BY name')
-        tags = c.fetchall()
-        conn.close()
+        tags = conn.execute('SELECT id, name FROM tags ORDER BY name').fetchall()
         return [f"{name}" for _, name in tags]
 
-def get_all_tags_perm() -> list[str]:
-        # get all tags from the database
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('SELECT id, name FROM tags ORDER BY name')
-        tags = c.fetchall()
-        conn.close()
-        tags = [name for _, name in tags]
-        tags = all_comma_separated(tags)
-        return tags
-
-
-
-
-class Paper(ListItem):
-    def __init__(self, label: str, arxiv_id: str) -> None:
-        super().__init__()
-        self.label = label
-        self.arxiv_id = arxiv_id
-
-    def compose( self ) -> ComposeResult:
-        yield Label(self.label)
-        yield Label(self.arxiv_id)
+class TagSuggester(Suggester):
+    """
+    Suggests completions for the last fragment of a comma-separated tag list.
+    Tags already present earlier in the input are skipped.
+    `tags` is called on every lookup, so it should return a cached list.
+    """
+    def __init__(self, tags: Callable[[], List[str]]) -> None:
+        # case handling is done here, so the user's earlier tags keep their casing
+        super().__init__(use_cache=False, case_sensitive=True)
+        self.tags = tags
+
+    async def get_suggestion(self, value: str) -> Optional[str]:
+        prefix, _, frag = value.rpartition(",")
+        frag = frag.lstrip()
+        if not frag:
+            return None
+        stem = frag.casefold()
+        used = {t.strip().casefold() for t in prefix.split(",")}
+        for tag in self.tags():
+            folded = tag.casefold()
+            if folded.startswith(stem) and folded not in used:
+                # the stored tag replaces the fragment, so its casing wins
+                return value[:len(value) - len(frag)] + tag
+        return None
 
 
 class PaperTagging(Input):
-    def __init__(self, arxiv_id: str, id: str) -> None:
-        super().__init__(id=id, placeholder="Enter tags for the paper (comma-separated)", suggester=SuggestFromList(get_all_tags_perm(), case_sensitive=False))
+    def __init__(self, arxiv_id: str, id: str, suggester: Optional[Suggester] = None) -> None:
+        super().__init__(id=id, placeholder="Enter tags for the paper (comma-separated)", suggester=suggester)
         self.arxiv_id = arxiv_id 
 
 
@@ -133,15 +327,11 @@ class BabelApp(App):
             max-height: 95%;
             overflow-y: auto;    
         }
-        ListView {
+        OptionList {
             height: auto;
             max-height: 60%;
             margin: 1 1;
         }
-
-        Label {
-            padding: 1 1;
-        }
         
     """
 
@@ -169,21 +359,52 @@ class BabelApp(App):
 
     def on_mount(self) -> None:
         # initialize the database if it doesn't exist
-        init_db()
+        self.conn = connect_db()
+        init_db(self.conn)
+        self._has_fts = has_fts(self.conn)
         self.theme = "gruvbox"
         self.title = "babel"
         self.filter_query = None
         self.filter_tag = None
+        # rendered rows keyed by (filter_tag, filter_query, schema_version);
+        # the version is bumped by every method that changes what the table shows
+        self._table_cache: OrderedDict[tuple, list[tuple]] = OrderedDict()
+        self._schema_version = 0
+        self._page_size = 200
+        self._reload_pending = False
+        # in-memory copy of the tag names, rebuilt only after tags change
+        self._tags_cache: List[str] = []
+        self._tags_dirty = True
+        self.tag_suggester = TagSuggester(self._get_tags)
+        # each paper's tags as shown in the table, by arXiv ID; filled in as
+        # rows are fetched and dropped whenever a paper's tags change
+        self._paper_tags: dict[str, str] = {}
+        # metadata for the title search results on offer, by arXiv ID
+        self._search_results: dict[str, tuple] = {}
+        self._submit_handlers = {
+            "tag_input": self._submit_tag_input,
+            "tag_modification": self._submit_tag_modification,
+            "confirm_remove": self._submit_confirm_remove,
+            "tag_filter": self._submit_tag_filter,
+            "search_input": self._submit_search_input,
+        }
         # load the papers table
         self.load_table()
+        # scrolling with the mouse doesn't move the cursor, so watch it too
+        self.watch(self.query_one("#papers", DataTable), "scroll_y", self._on_table_scroll, init=False)
+
+    def on_unmount(self) -> None:
+        self.conn.close()
+
+    def _get_tags(self) -> List[str]:
+        if self._tags_dirty:
+            self._tags_cache = get_all_tags(self.conn)
+            self._tags_dirty = False
+        return self._tags_cache
 
     def get_tag_from_id(self, tag_id: int) -> str:
         # get the tag name from the database by ID
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('SELECT name FROM tags WHERE id=?', (tag_id,))
-        row = c.fetchone()
-        conn.close()
+        row = self.conn.execute('SELECT name FROM tags WHERE id=?', (tag_id,)).fetchone()
         if row:
             return row[0]
         return ""
@@ -193,7 +414,7 @@ class BabelApp(App):
     # prompting for a set of tags to filter the papers by
     def action_show_tags(self):
         # prompt for a tag to filter the papers by
-        tag_input = Input(placeholder="Enter tag to filter by (leave empty to reset)", id="tag_filter", suggester=SuggestFromList(get_all_tags_perm(), case_sensitive=False))
+        tag_input = Input(placeholder="Enter tag to filter by (leave empty to reset)", id="tag_filter", suggester=self.tag_suggester)
         self.mount(tag_input)
         tag_input.focus()
 
@@ -202,7 +423,7 @@ class BabelApp(App):
         self.filter_query = None
         self.filter_tag = None
         # self.log_message("Resetting filters.", 'information')
-        self.load_table()
+        self._schedule_reload()
 
     def action_show_search(self):
         # prompt for a search query
@@ -215,37 +436,135 @@ class BabelApp(App):
         table = self.query_one("#papers", DataTable)
         table.clear(columns=True)
         table.zebra_stripes = True
-        table.add_columns("ArXiv ID", "Title", "Authors", "Tags")
+        # keyed columns and rows (by arXiv ID) so single rows can be patched later
+        for label, col in zip(("ArXiv ID", "Title", "Authors", "Tags"), TABLE_COLUMNS):
+            table.add_column(label, key=col)
         table.cursor_type = "row"
 
+        key = (self.filter_tag, self.filter_query, self._schema_version)
+        rows = self._table_cache.get(key)
+        if rows is None:
+            rows = self._fetch_rows()
+            self._table_cache[key] = rows
+            # keep only the most recent few views
+            if len(self._table_cache) > 16:
+                self._table_cache.popitem(last=False)
+        else:
+            self._table_cache.move_to_end(key)
+        # later pages are appended to this same (cached) list by _load_more
+        self._rows = rows
+        self._rows_exhausted = len(rows) < self._page_size
+        # add_rows can't take row keys, so add them one by one but repaint once
+        with self.batch_update():
+            for row in rows:
+                table.add_row(*row[:4], key=row[0])
+
+    # fetches the page after the last loaded row and appends it to the table
+    def _load_more(self) -> None:
+        table = self.query_one("#papers", DataTable)
+        last = self._rows[-1]
+        page = self._fetch_rows(after=(last[4], last[5]))
+        self._rows.extend(page)
+        self._rows_exhausted = len(page) < self._page_size
+        with self.batch_update():
+            for row in page:
+                table.add_row(*row[:4], key=row[0])
+
+    # brings one paper's row up to date after it was changed, instead of
+    # reloading the whole table; call after bumping _schema_version
+    def _refresh_row(self, aid: str) -> None:
+        table = self.query_one("#papers", DataTable)
+        fresh = self._fetch_rows(arxiv_id=aid)
+        idx = next((i for i, row in enumerate(self._rows) if row[0] == aid), None)
+        if idx is None:
+            # rows can only be appended, so a paper entering the view needs
+            # the full reload to land in the right place
+            if fresh:
+                self._schedule_reload()
+            return
+        if fresh:
+            self._rows[idx] = fresh[0]
+            for col, value in zip(TABLE_COLUMNS, fresh[0][:4]):
+                table.update_cell(aid, col, value)
+        else:
+            # removed, or no longer matches the current filters
+            del self._rows[idx]
+            table.remove_row(aid)
+        # the patched rows are the only cached view still valid
+        self._table_cache.clear()
+        self._table_cache[(self.filter_tag, self.filter_query, self._schema_version)] = self._rows
+
+    # only the first page is loaded up front, the rest follows the cursor or
+    # the scroll position once it gets within 20 rows of the end
+    def _maybe_load_more(self, row: int) -> None:
+        if not self._rows_exhausted and row >= len(self._rows) - 20:
+            self._load_more()
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        self._maybe_load_more(event.cursor_row)
+
+    def _on_table_scroll(self, scroll_y: float) -> None:
+        # rows are one line high, so this is the last row in view
+        table = self.query_one("#papers", DataTable)
+        self._maybe_load_more(int(scroll_y) + table.size.height)
+
+    # coalesces bursts of reload requests (e.g. add_tags followed by a reset)
+    # into a single redraw on the next 20ms tick
+    def _schedule_reload(self) -> None:
+        if self._reload_pending:
+            return
+        self._reload_pending = True
+        self.set_timer(0.02, self._do_reload)
+
+    def _do_reload(self) -> None:
+        self._reload_pending = False
+        self.load_table()
+
+    # runs the papers query for the current filters, already formatted for display;
+    # returns one page of (arxiv_id, title, authors, tags, published, id) rows,
+    # starting after the (published, id) position given in `after`, or just
+    # the row for `arxiv_id` if it matches the filters
+    def _fetch_rows(self, after: Optional[tuple] = None, arxiv_id: Optional[str] = None) -> list[tuple]:
+        # titles are truncated to 60 characters, including the ellipsis
         sql = """
-          SELECT p.arxiv_id, p.title, p.authors,
-                 COALESCE(GROUP_CONCAT(t.name, ', '), '') AS tags
+          SELECT p.arxiv_id,
+                 CASE WHEN length(p.title) > 60 THEN substr(p.title, 1, 57) || '...'
+                      ELSE p.title END AS title,
+                 p.authors_short,
+                 COALESCE((SELECT GROUP_CONCAT(t.name, ', ')
+                           FROM paper_tags pt JOIN tags t ON t.id = pt.tag_id
+                           WHERE pt.paper_id = p.id), '') AS tags,
+                 p.published, p.id
           FROM papers p
-          LEFT JOIN paper_tags pt ON p.id = pt.paper_id
-          LEFT JOIN tags t ON pt.tag_id = t.id
         """
         where, params = [], []
         if self.filter_tag:
-            where.append("t.name = ?"); params.append(self.filter_tag)
-        if self.filter_query:
+            where.append("""EXISTS (SELECT 1 FROM paper_tags pt2
+                                    JOIN tags t2 ON t2.id = pt2.tag_id
+                                    WHERE pt2.paper_id = p.id AND t2.name = ?)""")
+            params.append(self.filter_tag)
+        if self.filter_query and self._has_fts:
+            where.append("p.id IN (SELECT rowid FROM papers_fts WHERE papers_fts MATCH ?)")
+            params.append(fts_query(self.filter_query))
+        elif self.filter_query:
             where.append("(p.title LIKE ? OR p.authors LIKE ?)")
             q = f"%{self.filter_query}%"
             params.extend([q, q])
+        if arxiv_id:
+            where.append("p.arxiv_id = ?"); params.append(arxiv_id)
+        if after:
+            # keyset paging, so later pages cost the same as the first
+            where.append("(p.published, p.id) < (?, ?)")
+            params.extend(after)
         if where:
             sql += " WHERE " + " AND ".join(where)
-        sql += " GROUP BY p.id ORDER BY p.published DESC"
-
-        conn = sqlite3.connect(DB_PATH)
-        # truncate the title to a total of 50 characters, including the ellipsis
-        truncation = 60
-        trunc = lambda title: (title[:truncation-3] + '...') if len(title) > truncation else title
-        for aid, title, authors, tags in conn.execute(sql, params):
-            names = [n.strip() for n in authors.split(", ")] if authors else []
-            last5 = [n.split()[-1] for n in names[:5]]
-            disp_auth = ", ".join(last5)
-            table.add_row(aid, trunc(title), disp_auth, tags)
-        conn.close()
+        # tags come from a per-row subquery, so there is no GROUP BY and the
+        # ORDER BY is served straight from idx_papers_published
+        sql += " ORDER BY p.published DESC, p.id DESC LIMIT ?"
+        params.append(self._page_size)
+        rows = self.conn.execute(sql, params).fetchall()
+        self._paper_tags.update((row[0], row[3]) for row in rows)
+        return rows
 
     # writes a notification message as a toast widget
     def log_message(self, message: str, sev='information') -> None:
@@ -281,170 +600,160 @@ class BabelApp(App):
 
     def action_add_paper(self):
         # prompt for arXiv ID, title, or url
-        aid = Input(placeholder="Enter arXiv ID, title, author, or url to add")
+        aid = Input(placeholder="Enter arXiv ID(s), title, author, or url to add")
         self.mount(aid)
         aid.focus()
     
     def extract_arxiv_id(self, s: str) -> str:
         # from URL like https://arxiv.org/abs/1234.5678v1 or PDF link
-        m = re.search(ARXIV_REGEX, s)
+        m = _ARXIV_URL_RE.search(s)
         if m:
             return m.group(1)
         return s.strip()
 
     def get_paper_id_from_arxiv_id(self, aid: str) -> int:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('SELECT id FROM papers WHERE arxiv_id=?', (aid,))
-        row = c.fetchone()
-        conn.close()
+        row = self.conn.execute(PAPER_ID_SQL, (aid,)).fetchone()
         if row:
             return row[0]
         else:
             return -1
 
     # adds tags to the paper with the given arXiv ID
-    def add_tags(self, aid:str, tags: str) -> None:
+    # with replace=True the paper's existing tags are dropped in the same transaction
+    def add_tags(self, aid:str, tags: str, replace: bool = False) -> None:
         pid = self.get_paper_id_from_arxiv_id(aid)
         if pid == -1:
             self.log_message("No such paper ID.", 'error')
             return
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        for tag in [t.strip() for t in tags.split(',') if t.strip()]:
-            c.execute('INSERT OR IGNORE INTO tags (name) VALUES (?)', (tag,))
-            c.execute('SELECT id FROM tags WHERE name=?', (tag,))
-            tid = c.fetchone()[0]
-            c.execute('INSERT OR IGNORE INTO paper_tags (paper_id, tag_id) VALUES (?,?)', (pid, tid))
-        conn.commit()
-        conn.close()
-        self.load_table()
+        # split once on commas and surrounding whitespace, dropping empties and repeats
+        tag_list = list(dict.fromkeys(t for t in _TAG_SPLIT.split(tags.strip()) if t))
+        with self.conn:
+            c = self.conn.cursor()
+            if replace:
+                c.execute(UNLINK_TAGS_SQL, (pid,))
+            # two batched statements: upsert the tags, then link them by name
+            if tag_list:
+                c.executemany(INSERT_TAG_SQL, [(t,) for t in tag_list])
+                c.executemany(LINK_TAG_SQL, [(pid, t) for t in tag_list])
+        self._schema_version += 1
+        self._tags_dirty = True
+        self._paper_tags.pop(aid, None)
+        self._refresh_row(aid)
 
     def set_tags(self, aid: str, tags: str) -> None:
-        # replaces all existing tags with the new ones
-        pid = self.get_paper_id_from_arxiv_id(aid)
-        if pid == -1:
-            self.log_message("No such paper ID.", 'error')
-            return
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        # first delete all existing tags for this paper
-        c.execute('DELETE FROM paper_tags WHERE paper_id=?', (pid,))
-        # then add the new tags
-        conn.commit()
-        conn.close()
-        self.add_tags(aid, tags)
+        # replaces all existing tags with the new ones, atomically
+        self.add_tags(aid, tags, replace=True)
 
 
     # adds a paper based on user input
-    def add_paper(self, user_inp):
+    # arXiv requests block, so they run in a thread and the UI stays responsive;
+    # this runs as a worker, and a new lookup cancels one that is still pending
+    @work(exclusive=True, group="arxiv")
+    async def add_paper(self, user_inp):
+        # several IDs at once are fetched together
+        aids = [strip_url(self.extract_arxiv_id(p)) for p in _ID_SPLIT.split(user_inp.strip()) if p]
+        if len(aids) > 1 and all(_ARXIV_NEW_ID_RE.fullmatch(a) or _ARXIV_OLD_ID_RE.fullmatch(a) for a in aids):
+            return await self.add_papers_internal(aids)
         # check if the input is a URL or arXiv ID
-        # aid = self.extract_arxiv_id(user_inp)
-        aid = strip_url(user_inp)
+        aid = strip_url(self.extract_arxiv_id(user_inp))
         # if the extracted content does not look like an arXiv ID, do a title search
-        if not re.match(ARXIV_REGEX, user_inp):
-            search = arxiv.Search(query=f'ti:{aid}', max_results=20)
-            results = list(client.results(search))
+        if not (_ARXIV_NEW_ID_RE.fullmatch(aid) or _ARXIV_OLD_ID_RE.fullmatch(aid)):
+            title = aid.strip().lower()
+            results = await self._cached_results(f"ti:{title}", lambda: search_arxiv_titles(title))
             if not results:
-                # check the aid list, in case it matches something
-                search = arxiv.Search(id_list=[aid])
-                results = list(client.results(search))
-                if not results:
-                    self.log_message(f"No arXiv paper found with id {aid}.", 'error')
-                    return 2
-                if len(results) == 1:
-                    self.add_paper_internal(results[0].get_short_id())
-                    return 0
+                # anything shaped like an ID was looked up as one above
+                self.log_message(f"No arXiv results for {aid.strip()}.", 'error')
+                return 2
             # make a selectable list of results
-            items = [Paper(f"{entry.title}, authors: {', '.join(a.name for a in entry.authors)}", arxiv_id=entry.get_short_id()) for _, entry in enumerate(results)]
-            lv = ListView(*items, id="search_results")
-            self.mount(lv)
-            lv.focus()
+            # keep the full metadata so selecting a paper needs no second lookup
+            self._search_results = {meta[0]: meta for meta in results}
+            options = [Option(f"{meta[1]}, authors: {meta[4]}\n{short_id}", id=short_id)
+                       for short_id, meta in self._search_results.items()]
+            ol = OptionList(*options, id="search_results", markup=False)
+            self.mount(ol)
+            ol.focus()
         else:
-            self.add_paper_internal(aid)
+            await self.add_paper_internal(aid)
         
 
     # adds a paper given the exact arXiv ID, no user interaction
     # this interfaces with the database directly
-    def add_paper_internal(self, aid):
+    async def add_paper_internal(self, aid):
         self.log_message(f"Adding paper with arXiv ID: {aid}", 'information')
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
         # first check the database if the paper is already there
-        c.execute('SELECT id FROM papers WHERE arxiv_id=?', (aid,))
-        if c.fetchone():
+        if self.get_paper_id_from_arxiv_id(aid) != -1:
             self.log_message(f"Paper with arXiv ID {aid} already exists in the database.", 'warning')
-            conn.close()
             return 3 # exit code for already exists
         # search for the paper by ID on arxiv
-        search = arxiv.Search(id_list=[aid])
-        entry = next(client.results(search), None)
-        if entry is None:
+        try:
+            meta, = await self._cached_results(f"id:{aid}", lambda: [fetch_arxiv_meta(aid)])
+        except LookupError:
             self.log_message(f"No arXiv paper found with id {aid}.", 'error')
             return 2 # exit code for not found
-        try:
-            c.execute('''
-                INSERT INTO papers (arxiv_id, title, summary, published, authors, url)
-                VALUES (?,?,?,?,?,?)
-            ''', (
-                entry.get_short_id(),
-                entry.title,
-                entry.summary,
-                entry.published.strftime('%Y-%m-%d'),
-                ', '.join(a.name for a in entry.authors),
-                entry.entry_id
-            ))
-            pid = c.lastrowid
-            conn.commit()
-            # self.log_message(f"Added paper “{entry.title}” ({entry.get_short_id()}).", 'information')
-        except sqlite3.IntegrityError:
-            #TODO: I think this is redundant now
-            c.execute('SELECT id FROM papers WHERE arxiv_id=?', (entry.get_short_id(),))
-            pid = c.fetchone()[0]
-            self.log_message(f"Paper already in DB (id={pid}).", 'warning')
+        return self._insert_paper_row(meta)
+
+    # returns the entry_meta tuples for `key` from the on-disk cache if they are
+    # recent enough, otherwise runs the blocking `fetch` in a thread and stores
+    # a non-empty result; the database itself is only touched from here
+    async def _cached_results(self, key: str, fetch: Callable[[], List[tuple]]) -> List[tuple]:
+        now = int(time.time())
+        row = self.conn.execute('SELECT payload FROM arxiv_cache WHERE key=? AND fetched_at > ?',
+                                (key, now - ARXIV_CACHE_TTL)).fetchone()
+        if row:
+            return [tuple(meta) for meta in json.loads(row[0])]
+        results = await asyncio.to_thread(fetch)
+        if results:
+            with self.conn:
+                self.conn.execute('INSERT OR REPLACE INTO arxiv_cache (key, fetched_at, payload) VALUES (?,?,?)',
+                                  (key, now, json.dumps(results)))
+        return results
+
+    # adds several papers by exact arXiv ID with a single arXiv request;
+    # there is no tag prompt for a batch, tags are added with edit afterwards
+    async def add_papers_internal(self, aids: List[str]):
+        new = [aid for aid in dict.fromkeys(aids) if self.get_paper_id_from_arxiv_id(aid) == -1]
+        if not new:
+            self.log_message("All of these papers are already in the database.", 'warning')
             return 3 # exit code for already exists
-        conn.commit()
-        conn.close()
-        self.load_table()
+        self.log_message(f"Adding {len(new)} papers.", 'information')
+        metas = await self._cached_results(f"ids:{','.join(new)}", lambda: fetch_arxiv_metas(new))
+        if len(metas) < len(new):
+            self.log_message(f"{len(new) - len(metas)} of the IDs were not found on arXiv.", 'warning')
+        added = sum(self._insert_paper_row(meta, prompt_tags=False) == 0 for meta in metas)
+        return 0 if added else 2
+
+    # inserts already-fetched metadata (see entry_meta) and prompts for tags
+    def _insert_paper_row(self, meta: tuple, prompt_tags: bool = True):
+        aid, authors = meta[0], meta[4]
+        # a duplicate arxiv_id is ignored and returns no row, so no exception path
+        with self.conn:
+            row = self.conn.execute(INSERT_PAPER_SQL, (*meta, short_authors(authors))).fetchone()
+        if row is None:
+            self.log_message(f"Paper {aid} already in DB.", 'warning')
+            return 3 # exit code for already exists
+        self._schema_version += 1
+        # self.log_message(f"Added paper “{meta[1]}” ({aid}).", 'information')
+        # a new row has to be placed in order, so this one takes a full reload
+        self._schedule_reload()
+        if not prompt_tags:
+            return 0
         # add tags to the paper
-        paper_tagger = PaperTagging(arxiv_id=aid, id="tag_input") 
+        paper_tagger = PaperTagging(arxiv_id=aid, id="tag_input", suggester=self.tag_suggester)
         self.mount(paper_tagger)
         paper_tagger.focus()
         
         return 0 # exit code for success
 
-    def purge_unused_tags(self):
-        """
-        Remove tags that are not associated with any papers.
-        This is useful for cleaning up the database.
-        """
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('''
-            DELETE FROM tags
-            WHERE id NOT IN (SELECT DISTINCT tag_id FROM paper_tags)
-        ''')
-        conn.commit()
-        conn.close()
-        return 
-
     def get_current_tags(self, arxiv_id:str) -> str:
         """
         Get the current tags for a paper with the given arXiv ID.
         Returns a comma-separated string of tags.
         """
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('''
-            SELECT GROUP_CONCAT(t.name, ', ')
-            FROM tags t
-            JOIN paper_tags pt ON t.id = pt.tag_id
-            JOIN papers p ON pt.paper_id = p.id
-            WHERE p.arxiv_id = ?
-        ''', (arxiv_id,))
-        tags = c.fetchone()[0]
-        conn.close()
-        return tags if tags else ""
+        tags = self._paper_tags.get(arxiv_id)
+        if tags is None:
+            tags = self.conn.execute(CURRENT_TAGS_SQL, (arxiv_id,)).fetchone()[0] or ""
+            self._paper_tags[arxiv_id] = tags
+        return tags
 
     # editing the tags for a paper
     def action_edit_tags(self):
@@ -457,7 +766,7 @@ class BabelApp(App):
         # self.log_message(f"Editing tags for paper with arXiv ID: {arxiv_id}")
         # now make a input field, prepopulated with the current tags
         current_tags = self.get_current_tags(arxiv_id)
-        tag_input = PaperTagging(arxiv_id=arxiv_id, id="tag_modification")
+        tag_input = PaperTagging(arxiv_id=arxiv_id, id="tag_modification", suggester=self.tag_suggester)
         tag_input.value = current_tags
         self.mount(tag_input)
         tag_input.focus()
@@ -466,16 +775,15 @@ class BabelApp(App):
 
     # removing a paper, no confirmation
     def remove_paper(self, aid: str) -> None:
-        # first remove all tags for this paper
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('DELETE FROM paper_tags WHERE paper_id=(SELECT id FROM papers WHERE arxiv_id=?)', (aid,))
-        # then remove the paper itself
-        c.execute('DELETE FROM papers WHERE arxiv_id=?', (aid,))
-        conn.commit()
-        conn.close()
+        # the paper's tag links go with it through ON DELETE CASCADE
+        with self.conn:
+            self.conn.execute(DELETE_PAPER_SQL, (aid,))
+        self._schema_version += 1
+        # the purge trigger may have dropped tags along with the paper
+        self._tags_dirty = True
+        self._paper_tags.pop(aid, None)
         # self.log_message(f"Removed paper with arXiv ID: {aid}", 'information')
-        self.load_table()
+        self._refresh_row(aid)
         return
 
     def action_remove_paper(self):
@@ -493,70 +801,84 @@ class BabelApp(App):
         confirm.focus()
         return 
 
-    async def on_list_view_selected(self, event: ListView.Selected) -> None: 
-        event.list_view.remove()
-        aid = event.item.arxiv_id #type: ignore
-        # self.log_message(f"Selected paper: {aid}", 'information')
-        self.add_paper_internal(aid)
+    async def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        event.option_list.remove()
+        meta = self._search_results.pop(event.option.id)
+        self._search_results.clear()
+        # self.log_message(f"Selected paper: {meta[0]}", 'information')
+        # the search results already carry the metadata, so no second arXiv lookup
+        self.log_message(f"Adding paper with arXiv ID: {meta[0]}", 'information')
+        self._insert_paper_row(meta)
 
 
 
 
     async def on_input_submitted(self, event: Input.Submitted) -> None:
         event.input.remove()
-        if event.input.id == "tag_input":
-            aid = event.input.arxiv_id #type: ignore
-            # add tags to the last added paper
-            tags = event.input.value.strip()
-            if not tags:
-                self.log_message("No tags entered.", 'warning')
-                return
-            else:
-                # self.log_message(f"Adding tags to paper {aid}: {tags}", 'information')
-                self.add_tags(aid, tags)
-        elif event.input.id == "tag_modification":
-            aid = event.input.arxiv_id #type: ignore
-            tags = event.input.value.strip()
-            if not tags:
-                self.log_message("No tags entered.", 'warning')
-                return
-            else:
-                # self.log_message(f"Modifying tags for paper {aid}: {tags}", 'information')
-                self.set_tags(aid, tags)
-        elif event.input.id == "confirm_remove":
-            # remove the paper
-            aid = event.input.arxiv_id #type: ignore
-            if event.input.value.strip().lower() in ('y', 'yes'):
-                # self.log_message(f"Removing paper {aid}.")
-                self.remove_paper(aid)
-            else:
-                self.log_message("Removal cancelled.")
-        elif event.input.id == "tag_filter":
-            # get the tags to filter by 
-            tag = event.input.value.strip()
-            if not tag:
-                self.log_message("Resetting tag filter.", 'information')
-                self.filter_tag = None
-            else:
-                # self.log_message(f"Filtering by tag: {tag}", 'information')
-                self.filter_tag = tag
-            self.load_table()
-        elif event.input.id == "search_input":
-            # get the search query
-            query = event.input.value.strip()
-            if not query:
-                self.log_message("Resetting search query.", 'information')
-                self.filter_query = None
-            else:
-                # self.log_message(f"Searching for: {query}", 'information')
-                self.filter_query = query
-            self.load_table()
+        handler = self._submit_handlers.get(event.input.id, self._submit_add_paper)
+        if handler(event.input) & RELOAD:
+            self._schedule_reload()
+
+    # handlers for on_input_submitted, keyed by input id in on_mount; each returns
+    # RELOAD if the table needs redrawing (mutating methods schedule their own)
+    def _submit_tag_input(self, inp: Input) -> int:
+        aid = inp.arxiv_id #type: ignore
+        # add tags to the last added paper
+        tags = inp.value.strip()
+        if not tags:
+            self.log_message("No tags entered.", 'warning')
         else:
-            link = event.input.value.strip()
-            self.add_paper(link)
-            self.load_table()
-        # remove any unused tags from the database
-        self.purge_unused_tags()
+            # self.log_message(f"Adding tags to paper {aid}: {tags}", 'information')
+            self.add_tags(aid, tags)
+        return 0
+
+    def _submit_tag_modification(self, inp: Input) -> int:
+        aid = inp.arxiv_id #type: ignore
+        tags = inp.value.strip()
+        if not tags:
+            self.log_message("No tags entered.", 'warning')
+        else:
+            # self.log_message(f"Modifying tags for paper {aid}: {tags}", 'information')
+            self.set_tags(aid, tags)
+        return 0
+
+    def _submit_confirm_remove(self, inp: Input) -> int:
+        # remove the paper
+        aid = inp.arxiv_id #type: ignore
+        if inp.value.strip().lower() in ('y', 'yes'):
+            # self.log_message(f"Removing paper {aid}.")
+            self.remove_paper(aid)
+        else:
+            self.log_message("Removal cancelled.")
+        return 0
+
+    def _submit_tag_filter(self, inp: Input) -> int:
+        # get the tags to filter by 
+        tag = inp.value.strip()
+        if not tag:
+            self.log_message("Resetting tag filter.", 'information')
+            self.filter_tag = None
+        else:
+            # self.log_message(f"Filtering by tag: {tag}", 'information')
+            self.filter_tag = tag
+        return RELOAD
+
+    def _submit_search_input(self, inp: Input) -> int:
+        # get the search query
+        query = inp.value.strip()
+        if not query:
+            self.log_message("Resetting search query.", 'information')
+            self.filter_query = None
+        else:
+            # self.log_message(f"Searching for: {query}", 'information')
+            self.filter_query = query
+        return RELOAD
+
+    def _submit_add_paper(self, inp: Input) -> int:
+        link = inp.value.strip()
+        # the table is reloaded once the paper is actually inserted
+        self.add_paper(link)
+        return 0
 
 def tui():
     BabelApp().run()    